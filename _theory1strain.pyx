@@ -0,0 +1,26 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled Theory 1 (clamped cantilever) strain kernel for real-time callers.
+
+Build in place with:  python setup.py build_ext --inplace
+"""
+
+cdef double _PI_OVER_64 = 3.14159265358979323846 / 64.0
+
+
+cpdef (double, double, double) calc_theory1_strain_c(
+        double F, double x_F, double x_b, double L_b, double D_o_s,
+        double D_i_s, double h_b, double e_b, double E_s):
+    """
+    Calculate Theory 1 mechanical strains for scalar inputs.
+    
+    Same parameters and units as `theory1strain.calc_theory1_strain`.
+    Returns the C tuple (eps_top, eps_bottom, delta_eps), dimensionless.
+    """
+    cdef double x_gauge = x_b + L_b / 2.0
+    cdef double Do2 = D_o_s * D_o_s
+    cdef double Di2 = D_i_s * D_i_s
+    cdef double I_s = _PI_OVER_64 * (Do2 * Do2 - Di2 * Di2)
+    cdef double y_b = D_o_s / 2.0 + e_b
+    cdef double kappa = F * (x_F - x_gauge) / (E_s * I_s)
+    return kappa * (y_b + h_b / 2.0), kappa * (y_b - h_b / 2.0), kappa * h_b
@@ -0,0 +1,26 @@
+"""
+Build the optional compiled strain kernel (_theory1strain).
+
+    python setup.py build_ext --inplace
+
+theory1strain.py falls back to pure Python/numba when it is not built.
+"""
+
+import sys
+
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+if sys.platform == 'win32':
+    extra_compile_args = ['/O2', '/fp:fast']
+else:
+    extra_compile_args = ['-O3', '-march=native', '-ffast-math']
+
+setup(
+    name='theory1strain',
+    ext_modules=cythonize(
+        [Extension('_theory1strain', ['_theory1strain.pyx'],
+                   extra_compile_args=extra_compile_args)],
+        language_level=3,
+    ),
+)
@@ -4,11 +4,71 @@ Based on clamped cantilever beam model
 Author: Sylvain Boyer (Mecafrog.com)
 """
 
+import multiprocessing
+import sys
+from collections import namedtuple
+from functools import cached_property
+
 import numpy as np
 
+
+_PI_OVER_64 = np.pi / 64.0
+
+# run_study only dispatches grids at least this large to worker processes;
+# below it process start-up and pickling outweigh the broadcast evaluation
+_MIN_PARALLEL_CONFIGS = 10**6
+
+
+def _model_param(name):
+    """Property for a model parameter that invalidates derived quantities."""
+    attr = '_' + name
+    
+    def fget(self):
+        return getattr(self, attr)
+    
+    def fset(self, value):
+        setattr(self, attr, value)
+        self._clear_cache()
+    
+    return property(fget, fset)
+
+
+class StrainResult(namedtuple('StrainResult', [
+        'x_gauge', 'y_b', 'y_top', 'y_bottom', 'curvature',
+        'eps_top', 'eps_bottom', 'delta_eps'])):
+    """Gauge geometry [mm], curvature [1/mm] and strains (dimensionless)."""
+    
+    __slots__ = ()
+    
+    @property
+    def eps_top_ustrain(self):
+        return self.eps_top * 1e6
+    
+    @property
+    def eps_bottom_ustrain(self):
+        return self.eps_bottom * 1e6
+    
+    @property
+    def delta_eps_ustrain(self):
+        return self.delta_eps * 1e6
+
+
 class OarStrainCalculator:
     """Calculator for mechanical strains in rowing oar measurement system."""
     
+    # Parameters the cached properties below depend on
+    x_b = _model_param('x_b')
+    L_b = _model_param('L_b')
+    D_o_s = _model_param('D_o_s')
+    D_i_s = _model_param('D_i_s')
+    h_b = _model_param('h_b')
+    b = _model_param('b')
+    e_b = _model_param('e_b')
+    E_s = _model_param('E_s')
+    
+    _CACHED = ('shaft_inertia', 'shaft_stiffness', 'beam_inertia',
+               'gauge_position', 'gauge_radii')
+    
     def __init__(self):
         """Initialize with default Concept2 sculling oar parameters."""
         
@@ -37,65 +97,93 @@ class OarStrainCalculator:
         # Applied force [N]
         self.F = 1962.0           # Peak force (200 kg)
     
+    def _clear_cache(self):
+        """Drop cached derived quantities after a geometry change."""
+        for name in self._CACHED:
+            self.__dict__.pop(name, None)
+    
+    @cached_property
+    def shaft_inertia(self):
+        """Shaft second moment of area [mm^4]."""
+        Do2 = self.D_o_s * self.D_o_s
+        Di2 = self.D_i_s * self.D_i_s
+        return _PI_OVER_64 * (Do2 * Do2 - Di2 * Di2)
+    
+    @cached_property
+    def shaft_stiffness(self):
+        """Shaft bending stiffness E_s * I_s [N.mm^2]."""
+        return self.E_s * self.shaft_inertia
+    
+    @cached_property
+    def beam_inertia(self):
+        """Beam second moment of area [mm^4]."""
+        return (self.b * self.h_b * self.h_b * self.h_b) / 12.0
+    
+    @cached_property
+    def gauge_position(self):
+        """Gauge x-position [mm]."""
+        return self.x_b + self.L_b / 2.0
+    
+    @cached_property
+    def gauge_radii(self):
+        """Gauge y-positions (y_b, y_top, y_bottom) from shaft centerline [mm]."""
+        y_b = self.D_o_s / 2.0 + self.e_b
+        y_top = y_b + self.h_b / 2.0
+        y_bottom = y_b - self.h_b / 2.0
+        return y_b, y_top, y_bottom
+    
     def calc_shaft_inertia(self):
         """Calculate shaft second moment of area [mm^4]."""
-        D_o = self.D_o_s
-        D_i = self.D_i_s
-        return (np.pi / 64.0) * (D_o**4 - D_i**4)
+        return self.shaft_inertia
     
     def calc_beam_inertia(self):
         """Calculate beam second moment of area [mm^4]."""
-        return (self.b * self.h_b**3) / 12.0
+        return self.beam_inertia
     
     def calc_gauge_position(self):
         """Calculate gauge x-position [mm]."""
-        return self.x_b + self.L_b / 2.0
+        return self.gauge_position
     
     def calc_gauge_radii(self):
         """Calculate gauge y-positions from shaft centerline [mm]."""
-        y_b = self.D_o_s / 2.0 + self.e_b
-        y_top = y_b + self.h_b / 2.0
-        y_bottom = y_b - self.h_b / 2.0
-        return y_b, y_top, y_bottom
+        return self.gauge_radii
     
     def calc_curvature(self, x):
         """Calculate shaft curvature at position x [1/mm]."""
-        I_s = self.calc_shaft_inertia()
-        return self.F * (self.x_F - x) / (self.E_s * I_s)
+        return self.F * (self.x_F - x) / self.shaft_stiffness
     
-    def calc_strains(self):
-        """Calculate mechanical strains at gauge locations."""
+    def _strains(self, F):
+        """Mechanical strains at the gauge locations for applied force F."""
         # Geometry
-        x_gauge = self.calc_gauge_position()
-        y_b, y_top, y_bottom = self.calc_gauge_radii()
+        x_gauge = self.gauge_position
+        y_b, y_top, y_bottom = self.gauge_radii
         
         # Curvature at gauge
-        kappa = self.calc_curvature(x_gauge)
+        kappa = F * (self.x_F - x_gauge) / self.shaft_stiffness
         
         # Mechanical strains
         eps_top = kappa * y_top
         eps_bottom = kappa * y_bottom
-        delta_eps = eps_top - eps_bottom
-        
-        return {
-            'x_gauge': x_gauge,
-            'y_b': y_b,
-            'y_top': y_top,
-            'y_bottom': y_bottom,
-            'curvature': kappa,
-            'eps_top': eps_top,
-            'eps_bottom': eps_bottom,
-            'delta_eps': delta_eps,
-            'eps_top_ustrain': eps_top * 1e6,
-            'eps_bottom_ustrain': eps_bottom * 1e6,
-            'delta_eps_ustrain': delta_eps * 1e6
-        }
+        delta_eps = kappa * self.h_b
+        
+        return StrainResult(x_gauge, y_b, y_top, y_bottom, kappa,
+                            eps_top, eps_bottom, delta_eps)
+    
+    def calc_strains(self):
+        """Calculate mechanical strains at gauge locations."""
+        return self._strains(self.F)
+    
+    def calc_strains_vec(self, F_array):
+        """Calculate mechanical strains for an array of applied forces."""
+        return self._strains(np.asarray(F_array, dtype=float))
+    
+    def _bridge_ratio(self, delta_eps):
+        """Normalized bridge output V_out/V_ex for a differential strain."""
+        return (self.GF / 2.0) * delta_eps
     
     def calc_bridge_output(self):
         """Calculate normalized bridge output voltage."""
-        results = self.calc_strains()
-        delta_eps = results['delta_eps']
-        return (self.GF / 2.0) * delta_eps
+        return self._bridge_ratio(self.calc_strains().delta_eps)
     
     def print_results(self):
         """Print calculation results in readable format."""
@@ -114,26 +202,26 @@ class OarStrainCalculator:
         print(f"  Beam Eccentricity:    e_b = {self.e_b:.1f} mm")
         print(f"  Shaft Modulus:        E_s = {self.E_s/1e3:.0f} GPa")
         
-        I_s = self.calc_shaft_inertia()
-        I_b = self.calc_beam_inertia()
+        I_s = self.shaft_inertia
+        I_b = self.beam_inertia
         print(f"\nCalculated Properties:")
         print(f"  Shaft Inertia:        I_s = {I_s:.0f} mm^4")
         print(f"  Beam Inertia:         I_b = {I_b:.2f} mm^4")
         
         results = self.calc_strains()
         print(f"\nGauge Geometry:")
-        print(f"  Gauge Position:    x_gauge = {results['x_gauge']:.1f} mm")
-        print(f"  Beam Neutral Axis:    y_b = {results['y_b']:.1f} mm")
-        print(f"  Top Surface:        y_top = {results['y_top']:.1f} mm")
-        print(f"  Bottom Surface:  y_bottom = {results['y_bottom']:.1f} mm")
+        print(f"  Gauge Position:    x_gauge = {results.x_gauge:.1f} mm")
+        print(f"  Beam Neutral Axis:    y_b = {results.y_b:.1f} mm")
+        print(f"  Top Surface:        y_top = {results.y_top:.1f} mm")
+        print(f"  Bottom Surface:  y_bottom = {results.y_bottom:.1f} mm")
         
         print(f"\nMechanical Strains:")
-        print(f"  Curvature:          kappa = {results['curvature']*1e3:.3f} m^-1")
-        print(f"  Top Strain:       eps_top = {results['eps_top_ustrain']:.0f} µε")
-        print(f"  Bottom Strain: eps_bottom = {results['eps_bottom_ustrain']:.0f} µε")
-        print(f"  Differential:   delta_eps = {results['delta_eps_ustrain']:.0f} µε")
+        print(f"  Curvature:          kappa = {results.curvature*1e3:.3f} m^-1")
+        print(f"  Top Strain:       eps_top = {results.eps_top_ustrain:.0f} µε")
+        print(f"  Bottom Strain: eps_bottom = {results.eps_bottom_ustrain:.0f} µε")
+        print(f"  Differential:   delta_eps = {results.delta_eps_ustrain:.0f} µε")
         
-        V_ratio = self.calc_bridge_output()
+        V_ratio = self._bridge_ratio(results.delta_eps)
         V_out = V_ratio * self.V_ex * 1e3  # Convert to mV
         print(f"\nBridge Output:")
         print(f"  Normalized:     V_out/V_ex = {V_ratio*1e3:.3f} mV/V")
@@ -143,6 +231,152 @@ class OarStrainCalculator:
         print("=" * 60)
 
 
+class OarStrainCalculatorBatch(OarStrainCalculator):
+    """
+    Calculator holding N parameter sets, each parameter a length-N array.
+    
+    All OarStrainCalculator computations broadcast over the batch, so a
+    Monte Carlo tolerance study is one vectorized evaluation instead of N
+    calculator instances. The parameter arrays are read-only because the
+    cached derived quantities are only refreshed on assignment: to change
+    samples, assign a whole new array (e.g. ``batch.E_s = new_E_s``).
+    """
+    
+    PARAMS = ('x_F', 'x_b', 'L_b', 'D_o_s', 'D_i_s', 'h_b', 'b', 'e_b',
+              'E_s', 'E_b', 'GF', 'V_ex', 'F')
+    
+    def __init__(self, N, dtype=np.float64, **params):
+        """
+        Initialize N copies of the defaults, overridden by params.
+        
+        dtype sets the floating point type of the parameter arrays;
+        np.float32 halves memory traffic for large real-time batches.
+        """
+        super().__init__()
+        unknown = set(params) - set(self.PARAMS)
+        if unknown:
+            raise TypeError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+        
+        self.dtype = dtype
+        self.N = N
+        for name in self.PARAMS:
+            setattr(self, name, params.get(name, getattr(self, name)))
+    
+    def __setattr__(self, name, value):
+        # Store parameters as read-only length-N copies, so in-place element
+        # writes raise instead of silently bypassing the cache invalidation
+        if name in self.PARAMS and 'N' in self.__dict__:
+            value = np.broadcast_to(np.asarray(value, dtype=self.dtype), (self.N,)).copy()
+            value.flags.writeable = False
+        super().__setattr__(name, value)
+    
+    def calc_strains_vec(self, F_array):
+        """Not supported on a batch: set F as a length-N array instead."""
+        raise TypeError("calc_strains_vec is not supported by OarStrainCalculatorBatch; "
+                        "assign the forces to F and call calc_strains()")
+    
+    def print_results(self):
+        """Not supported on a batch: results are arrays, not a single report."""
+        raise TypeError("print_results is not supported by OarStrainCalculatorBatch; "
+                        "use calc_strains() and report the arrays")
+    
+    @classmethod
+    def from_iid(cls, mean_cfg, cov_cfg, N, rng=None, dtype=np.float64):
+        """
+        Sample N independent Gaussian parameter sets.
+        
+        Parameters
+        ----------
+        mean_cfg : dict[str, float]
+            Nominal values; parameters not listed keep the defaults.
+        cov_cfg : dict[str, float]
+            Variances (diagonal covariance) of the parameters to perturb;
+            parameters not listed are held at their nominal value.
+        N : int
+            Number of samples.
+        rng : numpy.random.Generator or int, optional
+            Random generator or seed.
+        dtype : numpy dtype, optional
+            Floating point type of the parameter arrays.
+        """
+        unknown = (set(mean_cfg) | set(cov_cfg)) - set(cls.PARAMS)
+        if unknown:
+            raise TypeError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+        
+        rng = np.random.default_rng(rng)
+        nominal = OarStrainCalculator()
+        params = {}
+        # Draw in the fixed PARAMS order so a seed gives reproducible samples
+        for name in cls.PARAMS:
+            if name not in mean_cfg and name not in cov_cfg:
+                continue
+            mean = mean_cfg.get(name, getattr(nominal, name))
+            std = np.sqrt(cov_cfg.get(name, 0.0))
+            params[name] = rng.normal(mean, std, N)
+        return cls(N, dtype=dtype, **params)
+
+
+def _eval_chunk(task):
+    """Evaluate a chunk of run_study configurations (module-level for pickling)."""
+    names, columns = task
+    calc = OarStrainCalculator()
+    for name, column in zip(names, columns):
+        setattr(calc, name, column)
+    results = calc.calc_strains()
+    return np.stack(np.broadcast_arrays(results.eps_top, results.eps_bottom,
+                                        results.delta_eps), axis=-1)
+
+
+def run_study(param_grid, processes=None):
+    """
+    Evaluate the strains over the full factorial grid of the given parameters.
+    
+    Parameters
+    ----------
+    param_grid : dict[str, array_like]
+        Maps OarStrainCalculator parameter names (e.g. 'F', 'h_b', 'e_b',
+        'E_s') to the values to sweep. Parameters not listed keep their
+        default value.
+    processes : int, optional
+        Number of worker processes. By default the whole grid is evaluated
+        in-process with one broadcast calc_strains call, which is already
+        memory-bound; with processes > 1, grids of at least
+        _MIN_PARALLEL_CONFIGS configurations are split into ~8 chunks per
+        worker and each chunk is evaluated the same way. Workers use the
+        'spawn' start method, so scripts calling this must guard their
+        entry point with ``if __name__ == "__main__":``.
+    
+    Returns
+    -------
+    ndarray
+        Array of shape (len(v1), len(v2), ..., 3) holding eps_top,
+        eps_bottom and delta_eps (dimensionless) for every configuration.
+    """
+    unknown = set(param_grid) - set(OarStrainCalculatorBatch.PARAMS)
+    if unknown:
+        raise TypeError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    
+    names = tuple(param_grid)
+    values = [np.asarray(param_grid[name], dtype=float).ravel() for name in names]
+    shape = tuple(len(v) for v in values)
+    columns = [grid.ravel() for grid in np.meshgrid(*values, indexing='ij')]
+    n_configs = int(np.prod(shape))
+    
+    if processes is None or processes < 2 or n_configs < _MIN_PARALLEL_CONFIGS:
+        return _eval_chunk((names, columns)).reshape(shape + (3,))
+    
+    # Large grid: one broadcast evaluation per chunk, ~8 chunks per worker
+    edges = np.linspace(0, n_configs, min(n_configs, 8 * processes) + 1).astype(int)
+    tasks = [(names, [column[start:stop] for column in columns])
+             for start, stop in zip(edges[:-1], edges[1:])]
+    
+    # spawn rather than fork: forking after numba's threading layer has
+    # started (e.g. a theory1strain array kernel ran) can hang at exit
+    with multiprocessing.get_context('spawn').Pool(processes) as pool:
+        out = np.concatenate(pool.map(_eval_chunk, tasks))
+    return out.reshape(shape + (3,))
+
+
 def parametric_study_force():
     """Example: Parametric study varying applied force."""
     print("\nPARAMETRIC STUDY: Strain vs Force")
@@ -154,32 +388,49 @@ def parametric_study_force():
     print(f"{'Force [N]':>10} {'eps_top [µε]':>15} {'delta_eps [µε]':>15} {'V_out [mV]':>12}")
     print("-" * 60)
     
-    for F in forces:
-        calc.F = F
-        results = calc.calc_strains()
-        V_out = calc.calc_bridge_output() * calc.V_ex * 1e3
-        
-        print(f"{F:10.0f} {results['eps_top_ustrain']:15.0f} "
-              f"{results['delta_eps_ustrain']:15.0f} {V_out:12.3f}")
+    results = calc.calc_strains_vec(forces)
+    V_out = calc._bridge_ratio(results.delta_eps) * calc.V_ex * 1e3
+    
+    table = np.column_stack((forces, results.eps_top_ustrain,
+                             results.delta_eps_ustrain, V_out))
+    np.savetxt(sys.stdout, table, fmt=['%10.0f', '%15.0f', '%15.0f', '%12.3f'])
 
 
-def parametric_study_geometry():
-    """Example: Parametric study varying beam height."""
-    print("\nPARAMETRIC STUDY: Strain vs Beam Height")
+def parametric_study_geometry(forces=None, heights=None):
+    """Example: Parametric study varying beam height and applied force."""
+    print("\nPARAMETRIC STUDY: Differential Strain [µε] vs Beam Height and Force")
     print("-" * 60)
     
     calc = OarStrainCalculator()
-    heights = np.array([1.0, 1.5, 2.0, 2.5, 3.0])
+    if forces is None:
+        forces = np.array([500, 1000, 1500, 1962, 2500])
+    if heights is None:
+        heights = np.array([1.0, 1.5, 2.0, 2.5, 3.0])
+    forces = np.asarray(forces, dtype=float)
+    heights = np.asarray(heights, dtype=float)
+    
+    x_gauge = calc.gauge_position
+    
+    # (len(heights), len(forces)) grid by broadcasting
+    delta_eps_grid = (forces[None, :] * (calc.x_F - x_gauge) * heights[:, None]
+                      / calc.shaft_stiffness)
+    
+    V_out_grid = calc._bridge_ratio(delta_eps_grid) * calc.V_ex * 1e3
     
-    print(f"{'h_b [mm]':>10} {'delta_eps [µε]':>15} {'V_out [mV]':>12}")
+    header = " ".join(f"{F:>9.0f}N" for F in forces)
+    print(f"{'h_b [mm]':>10} {header}")
     print("-" * 60)
+    table = np.column_stack((heights, delta_eps_grid * 1e6))
+    np.savetxt(sys.stdout, table, fmt=['%10.1f'] + ['%10.0f'] * len(forces))
     
-    for h in heights:
-        calc.h_b = h
-        results = calc.calc_strains()
-        V_out = calc.calc_bridge_output() * calc.V_ex * 1e3
-        
-        print(f"{h:10.1f} {results['delta_eps_ustrain']:15.0f} {V_out:12.3f}")
+    print("\nPARAMETRIC STUDY: Bridge Output V_out [mV] vs Beam Height and Force")
+    print("-" * 60)
+    print(f"{'h_b [mm]':>10} {header}")
+    print("-" * 60)
+    table = np.column_stack((heights, V_out_grid))
+    np.savetxt(sys.stdout, table, fmt=['%10.1f'] + ['%10.3f'] * len(forces))
+    
+    return delta_eps_grid, V_out_grid
 
 
 if __name__ == "__main__":
@@ -1,12 +1,172 @@
+import functools
+import math
+
 import numpy as np
 
+try:
+    from numba import float64, guvectorize, njit, vectorize
+except ImportError:  # numba is optional, plain NumPy broadcasting is used instead
+    guvectorize = njit = vectorize = None
+
+try:
+    from _theory1strain import calc_theory1_strain_c
+except ImportError:  # compiled kernel not built, see setup.py
+    calc_theory1_strain_c = None
+
+
+_PI_OVER_64 = math.pi / 64.0
+
+
+# Scalar argument types whose strains are float64 on every path, so they may
+# use the compiled kernel; other NumPy scalars take the plain Python path to
+# keep their dtype, and arrays go through the ufuncs
+_FLOAT64_TYPES = frozenset(
+    {int, float, np.float64}
+    | {t for t in np.sctypeDict.values() if issubclass(t, np.integer)})
+_SCALAR_TYPES = _FLOAT64_TYPES | frozenset(
+    t for t in np.sctypeDict.values() if issubclass(t, np.floating))
+_SCALAR_OR_ARRAY_TYPES = _SCALAR_TYPES | {np.ndarray}
+
+
+def _lazy_compile(compile, func):
+    """Defer numba compilation of func to its first call."""
+    compiled = None
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal compiled
+        if compiled is None:
+            compiled = compile(func)
+        return compiled(*args, **kwargs)
+    
+    return wrapper
+
+
+def _ufunc(n_args, **options):
+    """Compile (on first call) into a parallel float32/float64 ufunc when numba is available."""
+    signature = [f'{t}(' + ', '.join([t] * n_args) + ')' for t in ('float32', 'float64')]
+    
+    def decorator(func):
+        if vectorize is None:
+            return func
+        return _lazy_compile(
+            vectorize(signature, target='parallel', cache=True, **options), func)
+    
+    return decorator
+
+
+def _jit(func):
+    """Compile func with numba.njit so the kernels below can call it."""
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+
+def _shaft_inertia(D_o_s, D_i_s):
+    """Shaft second moment of area [mm^4]."""
+    Do2 = D_o_s * D_o_s
+    Di2 = D_i_s * D_i_s
+    return _PI_OVER_64 * (Do2 * Do2 - Di2 * Di2)
+
+
+def _gauge_position(x_b, L_b):
+    """Gauge x-position [mm]."""
+    return x_b + L_b / 2.0
+
+
+# Versions callable from the numba ufunc and gufunc bodies
+_shaft_inertia_jit = _jit(_shaft_inertia)
+_gauge_position_jit = _jit(_gauge_position)
+
+
+def _theory1_strain_py(F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s):
+    """Strains (eps_top, eps_bottom, delta_eps) for scalar inputs in plain Python."""
+    x_gauge = _gauge_position(x_b, L_b)
+    I_s = _shaft_inertia(D_o_s, D_i_s)
+    y_b = D_o_s / 2.0 + e_b
+    kappa = F * (x_F - x_gauge) / (E_s * I_s)
+    return kappa * (y_b + h_b / 2.0), kappa * (y_b - h_b / 2.0), kappa * h_b
+
+
+@_ufunc(9)
+def _eps_top_u(F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s):
+    """Top surface strain (dimensionless)."""
+    x_gauge = _gauge_position_jit(x_b, L_b)
+    I_s = _shaft_inertia_jit(D_o_s, D_i_s)
+    y_top = D_o_s / 2.0 + e_b + h_b / 2.0
+    return F * (x_F - x_gauge) * y_top / (E_s * I_s)
+
+
+@_ufunc(9)
+def _eps_bottom_u(F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s):
+    """Bottom surface strain (dimensionless)."""
+    x_gauge = _gauge_position_jit(x_b, L_b)
+    I_s = _shaft_inertia_jit(D_o_s, D_i_s)
+    y_bottom = D_o_s / 2.0 + e_b - h_b / 2.0
+    return F * (x_F - x_gauge) * y_bottom / (E_s * I_s)
+
+
+@_ufunc(9)
+def _delta_eps_u(F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s):
+    """Differential strain between top and bottom surfaces (dimensionless)."""
+    x_gauge = _gauge_position_jit(x_b, L_b)
+    I_s = _shaft_inertia_jit(D_o_s, D_i_s)
+    return F * (x_F - x_gauge) * h_b / (E_s * I_s)
+
+
+@_ufunc(10, fastmath=True)
+def bridge_output_u(F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s, GF):
+    """
+    Normalized bridge output V_out/V_ex from Theory 1 (dimensionless).
+    
+    Closed-form ufunc for calibration fits: no intermediate allocation, and
+    array arguments broadcast (e.g. F as samples, E_s along another axis).
+    e_b does not enter the differential strain but is kept so the argument
+    list matches `calc_theory1_strain`.
+    """
+    x_gauge = _gauge_position_jit(x_b, L_b)
+    I_s = _shaft_inertia_jit(D_o_s, D_i_s)
+    return (GF / 2.0) * F * (x_F - x_gauge) * h_b / (E_s * I_s)
+
+
+# Scalar kernel: the compiled one when built, else plain Python
+_scalar_strain = calc_theory1_strain_c or _theory1_strain_py
+
+
+def _strains_u(*args):
+    """Broadcast array inputs through the three strain ufuncs."""
+    return _eps_top_u(*args), _eps_bottom_u(*args), _delta_eps_u(*args)
+
+
+def _strain_kernel(F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s, components, out):
+    """Write eps_top, eps_bottom, delta_eps (dimensionless) into out."""
+    x_gauge = _gauge_position_jit(x_b, L_b)
+    I_s = _shaft_inertia_jit(D_o_s, D_i_s)
+    y_b = D_o_s / 2.0 + e_b
+    kappa = F * (x_F - x_gauge) / (E_s * I_s)
+    out[0] = kappa * (y_b + h_b / 2.0)
+    out[1] = kappa * (y_b - h_b / 2.0)
+    out[2] = kappa * h_b
+
+
+if guvectorize is not None:
+    # numba cannot size an output-only core dimension, so the length-3
+    # `components` argument only carries n into the signature
+    _strain_kernel = _lazy_compile(guvectorize(
+        [(float64,) * 9 + (float64[:], float64[:])],
+        '(),(),(),(),(),(),(),(),(),(n)->(n)',
+        target='parallel', cache=True), _strain_kernel)
+
+_STRAIN_COMPONENTS = np.empty(3)
+
+
 def calc_theory1_strain(F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s):
     """
     Calculate mechanical strains from Theory 1 (clamped cantilever).
     
     Parameters
     ----------
-    F : float
+    F : float or array_like
         Applied force at handle [N]
     x_F : float
         Handle position [mm]
@@ -28,38 +188,176 @@ def calc_theory1_strain(F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s):
     Returns
     -------
     dict
-        Dictionary containing strains in microstrain (µε)
+        Dictionary containing strains in microstrain (µε). Array inputs
+        broadcast against each other and give arrays of strains.
+    
+    Notes
+    -----
+    Real-time callers needing the lowest per-sample latency should call
+    `calc_theory1_strain_c` (built from _theory1strain.pyx, see setup.py)
+    directly: it takes scalars only and returns the C tuple
+    (eps_top, eps_bottom, delta_eps) without building this dict.
     """
     
+    # Mechanical strains (dimensionless). The type tests are unrolled since
+    # they dominate the cost of a scalar call
+    f64 = _FLOAT64_TYPES
+    if (type(F) in f64 and type(x_F) in f64 and type(x_b) in f64
+            and type(L_b) in f64 and type(D_o_s) in f64 and type(D_i_s) in f64
+            and type(h_b) in f64 and type(e_b) in f64 and type(E_s) in f64):
+        eps_top, eps_bottom, delta_eps = _scalar_strain(
+            F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s)
+    else:
+        args = (F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s)
+        types = set(map(type, args))
+        if types <= _SCALAR_TYPES or (types <= _SCALAR_OR_ARRAY_TYPES
+                                      and not any(getattr(a, 'ndim', 0) for a in args)):
+            # Other NumPy scalars and 0-d arrays, keeping their dtype
+            eps_top, eps_bottom, delta_eps = _theory1_strain_py(*args)
+        else:
+            eps_top, eps_bottom, delta_eps = _strains_u(*args)
+    
+    # Convert to microstrain
+    return {
+        'eps_top_ustrain': eps_top * 1e6,
+        'eps_bottom_ustrain': eps_bottom * 1e6,
+        'delta_eps_ustrain': delta_eps * 1e6,
+        'eps_top': eps_top,
+        'eps_bottom': eps_bottom,
+        'delta_eps': delta_eps
+    }
+
+
+def calc_theory1_strain_batch(F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s,
+                              dtype=np.float64):
+    """
+    Calculate Theory 1 mechanical strains for arrays of parameters.
+    
+    Same model as `calc_theory1_strain`, evaluated with plain NumPy
+    broadcasting so that Monte Carlo or sweep studies need no Python loop.
+    
+    Parameters
+    ----------
+    F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s : float or array_like
+        Same quantities and units as `calc_theory1_strain`. Arguments are
+        broadcast against each other following the NumPy rules: all scalars
+        give 0-d arrays, and e.g. an F of shape (1000,) with an E_s of shape
+        (50, 1) gives results of shape (50, 1000).
+    dtype : numpy dtype, optional
+        Floating point type of the computation, np.float64 by default.
+        np.float32 halves memory traffic for high-rate DAQ streams and is
+        ample for display (µε resolved to ~1e-4); keep np.float64 for
+        scientific reporting.
+    
+    Returns
+    -------
+    dict
+        Same keys as `calc_theory1_strain`, each an ndarray of the
+        broadcast shape and of the requested dtype.
+    """
+    F = np.asarray(F, dtype=dtype)
+    x_F = np.asarray(x_F, dtype=dtype)
+    x_b = np.asarray(x_b, dtype=dtype)
+    L_b = np.asarray(L_b, dtype=dtype)
+    D_o_s = np.asarray(D_o_s, dtype=dtype)
+    D_i_s = np.asarray(D_i_s, dtype=dtype)
+    h_b = np.asarray(h_b, dtype=dtype)
+    e_b = np.asarray(e_b, dtype=dtype)
+    E_s = np.asarray(E_s, dtype=dtype)
+    
+    # Constants in the working precision
+    scalar = np.dtype(dtype).type
+    two = scalar(2.0)
+    ustrain = scalar(1e6)
+    
     # Gauge position
-    x_gauge = x_b + L_b / 2.0
+    x_gauge = np.asarray(_gauge_position(x_b, L_b), dtype=dtype)
     
     # Shaft second moment of area
-    I_s = (np.pi / 64.0) * (D_o_s**4 - D_i_s**4)
+    I_s = np.asarray(_shaft_inertia(D_o_s, D_i_s), dtype=dtype)
     
     # Beam neutral axis position
-    y_b = D_o_s / 2.0 + e_b
+    y_b = D_o_s / two + e_b
     
     # Top and bottom surface positions
-    y_top = y_b + h_b / 2.0
-    y_bottom = y_b - h_b / 2.0
+    y_top = y_b + h_b / two
+    y_bottom = y_b - h_b / two
+    
+    # Curvature at gauge
+    kappa = F * (x_F - x_gauge) / (E_s * I_s)
     
     # Mechanical strains (dimensionless)
-    eps_top = F * (x_F - x_gauge) * y_top / (E_s * I_s)
-    eps_bottom = F * (x_F - x_gauge) * y_bottom / (E_s * I_s)
-    delta_eps = F * (x_F - x_gauge) * h_b / (E_s * I_s)
+    eps_top = np.asarray(kappa * y_top)
+    eps_bottom = np.asarray(kappa * y_bottom)
+    delta_eps = np.asarray(kappa * h_b)
     
     # Convert to microstrain
     return {
-        'eps_top_ustrain': eps_top * 1e6,
-        'eps_bottom_ustrain': eps_bottom * 1e6,
-        'delta_eps_ustrain': delta_eps * 1e6,
+        'eps_top_ustrain': np.asarray(eps_top * ustrain),
+        'eps_bottom_ustrain': np.asarray(eps_bottom * ustrain),
+        'delta_eps_ustrain': np.asarray(delta_eps * ustrain),
         'eps_top': eps_top,
         'eps_bottom': eps_bottom,
         'delta_eps': delta_eps
     }
 
 
+def calc_theory1_strain_stacked(F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s):
+    """
+    Calculate all three Theory 1 strains in a single pass over the inputs.
+    
+    Parameters
+    ----------
+    F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s : float or array_like
+        Same quantities and units as `calc_theory1_strain`, broadcast
+        against each other.
+    
+    Returns
+    -------
+    ndarray
+        Array of shape broadcast_shape + (3,) holding eps_top, eps_bottom
+        and delta_eps (dimensionless) along the last axis, e.g. (N, 3) for
+        an F array of length N. Always float64: float32 inputs are upcast.
+    """
+    if guvectorize is None:
+        result = calc_theory1_strain_batch(F, x_F, x_b, L_b, D_o_s, D_i_s,
+                                           h_b, e_b, E_s)
+        return np.stack((result['eps_top'], result['eps_bottom'],
+                         result['delta_eps']), axis=-1)
+    return _strain_kernel(F, x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s,
+                          _STRAIN_COMPONENTS)
+
+
+def make_delta_eps_fn(x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s):
+    """
+    Build a differential strain function specialized to a fixed oar.
+    
+    For a given instrumented oar every parameter but the force is constant,
+    so Theory 1 reduces to delta_eps = k * F. The constant k is computed
+    once here and the returned function costs one multiply per sample.
+    
+    Parameters
+    ----------
+    x_F, x_b, L_b, D_o_s, D_i_s, h_b, e_b, E_s : float
+        Same quantities and units as `calc_theory1_strain`. e_b does not
+        enter the differential strain and is accepted for symmetry.
+    
+    Returns
+    -------
+    callable
+        delta_eps(F) giving the differential strain (dimensionless) for a
+        force F [N], scalar or ndarray.
+    """
+    x_gauge = _gauge_position(x_b, L_b)
+    I_s = _shaft_inertia(D_o_s, D_i_s)
+    k = (x_F - x_gauge) * h_b / (E_s * I_s)
+    
+    def delta_eps(F):
+        return F * k
+    
+    return delta_eps
+
+
 # Example usage with Concept2 parameters
 if __name__ == "__main__":
     result = calc_theory1_strain(